@@ -1,11 +1,15 @@
 # Scenic Seat FastAPI Application
 import os
-import json
+import logging
+import time
+import orjson
 from datetime import datetime
-from typing import Union
+from functools import lru_cache
+from typing import Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
+from pydantic import TypeAdapter
 import fastapi
 import pydantic
 import astral
@@ -19,25 +23,36 @@ from api_schemas import (
 )
 from utils import (
     bearing_gc, sun_azimuth_at, phase_times, golden_hour_flag, 
-    midpoint, seat_decision, normalize180
+    midpoint, seat_decision, SeatRec, normalize180, parse_local_datetime, gc_distance_km
 )
 from pdf_export import generate_pdf
+from orjson_response import ORJSONResponse
+
+logger = logging.getLogger(__name__)
 
 # Load city database
-with open('citydb.json', 'r') as f:
-    CITY_DB = json.load(f)['cities']
+with open('citydb.json', 'rb') as f:
+    CITY_DB = orjson.loads(f.read())['cities']
 
 # Create city lookup by name (case-insensitive)
 CITY_LOOKUP = {city['name'].lower(): city for city in CITY_DB}
 
+# Routes shorter than this reuse the departure sun position at the midpoint
+SHORT_FLIGHT_KM = 300.0
+
+# Compile the response schema once instead of per request
+REC_ADAPTER = TypeAdapter(RecommendationResponse)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Scenic Seat API",
     description="Window seat recommendations for flights based on solar position",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration based on environment variable
+# FRONTEND_ORIGIN is a single origin (e.g. "https://app.example.com") or "*"
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 app.add_middleware(
     CORSMiddleware,
@@ -45,12 +60,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=[],
+    # Let browsers cache preflight responses for a day instead of
+    # re-sending OPTIONS before every /recommend call
+    max_age=86400,
 )
 
 
+@lru_cache(maxsize=4096)
+def _lookup_city(name: str) -> Optional[dict]:
+    """Cached case-insensitive lookup; returns None for unknown cities."""
+    return CITY_LOOKUP.get(name.lower())
+
+
 def find_city(name: str) -> dict:
     """Find city in database by name (case-insensitive)."""
-    city = CITY_LOOKUP.get(name.lower())
+    city = _lookup_city(name)
     if not city:
         raise HTTPException(
             status_code=400,
@@ -59,61 +84,83 @@ def find_city(name: str) -> dict:
     return city
 
 
-def calculate_stability(departure_decision: dict, midpoint_decision: dict, 
-                       departure_delta: float, midpoint_delta: float) -> str:
-    """Calculate stability classification based on departure vs midpoint analysis."""
-    
-    # If seat side differs between departure and midpoint, stability is LOW
-    if (departure_decision["side"] != "EITHER" and 
-        midpoint_decision["side"] != "EITHER" and
-        departure_decision["side"] != midpoint_decision["side"]):
-        return "LOW"
-    
-    # If either has low confidence due to sun being ahead/behind, stability is LOW
-    if abs(departure_delta) < 15 or abs(departure_delta) > 150:
-        return "LOW"
-    if abs(midpoint_delta) < 15 or abs(midpoint_delta) > 150:
+@lru_cache(maxsize=2048)
+def cached_sun_azimuth_at(lat: float, lon: float, tz_str: str, local_dt: datetime) -> float:
+    """sun_azimuth_at memoized on the exact parsed datetime (clients send whole-minute times)."""
+    return sun_azimuth_at(lat, lon, tz_str, local_dt)
+
+
+def _stability_band(delta: float) -> int:
+    """Map |Δ| to its confidence band: 0 <15°, 1 [15°,45°), 2 [45°,135°], 3 (135°,150°], 4 >150°."""
+    abs_delta = abs(delta)
+    return (abs_delta >= 15) + (abs_delta >= 45) + (abs_delta > 135) + (abs_delta > 150)
+
+
+def _stability_for_bands(departure_band: int, midpoint_band: int, sides_conflict: bool) -> str:
+    # Seat side differs between departure and midpoint, or the sun is
+    # ahead/behind at either point (bands 0 and 4): stability is LOW
+    if sides_conflict or departure_band in (0, 4) or midpoint_band in (0, 4):
         return "LOW"
-    
-    # If crossing confidence band boundaries, stability is MEDIUM
-    departure_abs = abs(departure_delta)
-    midpoint_abs = abs(midpoint_delta)
-    
-    # Define confidence band boundaries
-    if ((departure_abs < 45 and midpoint_abs >= 45) or
-        (departure_abs >= 45 and midpoint_abs < 45) or
-        (departure_abs <= 135 and midpoint_abs > 135) or
-        (departure_abs > 135 and midpoint_abs <= 135)):
+    # Crossing a confidence band boundary (45° or 135°): stability is MEDIUM
+    if departure_band != midpoint_band:
         return "MEDIUM"
-    
-    # Otherwise, stability is HIGH
     return "HIGH"
 
 
+# Every (departure band, midpoint band, sides conflict) outcome, resolved once
+_STABILITY_TABLE = {
+    (departure_band, midpoint_band, sides_conflict): _stability_for_bands(departure_band, midpoint_band, sides_conflict)
+    for departure_band in range(5)
+    for midpoint_band in range(5)
+    for sides_conflict in (False, True)
+}
+
+
+def calculate_stability(departure_decision: SeatRec, midpoint_decision: SeatRec, 
+                       departure_delta: float, midpoint_delta: float) -> str:
+    """Calculate stability classification based on departure vs midpoint analysis."""
+    departure_side = departure_decision.side
+    midpoint_side = midpoint_decision.side
+    sides_conflict = (departure_side != midpoint_side and
+                      departure_side != "EITHER" and midpoint_side != "EITHER")
+    return _STABILITY_TABLE[
+        _stability_band(departure_delta), _stability_band(midpoint_delta), sides_conflict
+    ]
+
+
 @app.get("/")
 def root():
     return {"message": "Scenic Seat API", "version": "1.0.0"}
 
 
-@app.get("/healthz", response_model=HealthResponse)
+# Library versions don't change while the process is running
+BASE_HEALTH = {
+    "status": "healthy",
+    "version": "1.0.0",
+    "libraries": {
+        "fastapi": fastapi.__version__,
+        "pydantic": pydantic.VERSION,
+        "astral": astral.__version__,
+        "geopy": geopy.__version__,
+        "python-dateutil": dateutil.__version__,
+        "reportlab": reportlab.Version
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _health_timestamp(epoch_second: int) -> str:
+    """ISO timestamp for the given second; rebuilt at most once per second."""
+    return datetime.utcfromtimestamp(epoch_second).isoformat() + "Z"
+
+
+@app.get("/healthz", responses={200: {"model": HealthResponse}})
 def health_check():
     """Health check endpoint that returns library versions and status."""
-    return HealthResponse(
-        status="healthy",
-        version="1.0.0",
-        libraries={
-            "fastapi": fastapi.__version__,
-            "pydantic": pydantic.VERSION,
-            "astral": astral.__version__,
-            "geopy": geopy.__version__,
-            "python-dateutil": dateutil.__version__,
-            "reportlab": reportlab.Version
-        },
-        timestamp=datetime.utcnow().isoformat() + "Z"
-    )
-
-
-@app.post("/recommend", response_model=Union[RecommendationResponse, ErrorResponse])
+    return ORJSONResponse({**BASE_HEALTH, "timestamp": _health_timestamp(int(time.time()))})
+
+
+@app.post("/recommend", responses={200: {"model": RecommendationResponse}, 400: {"model": ErrorResponse}})
 def get_recommendation(request: RecommendationRequest):
     """Generate seat recommendation based on flight route and solar position."""
     
@@ -132,7 +179,9 @@ def get_recommendation(request: RecommendationRequest):
         
         # Calculate sun position at departure
         try:
-            sun_az = sun_azimuth_at(origin_lat, origin_lon, origin_tz, request.local_datetime)
+            # Parse the departure time once and reuse it for every solar calculation
+            local_dt = parse_local_datetime(request.local_datetime, origin_tz)
+            sun_az = cached_sun_azimuth_at(origin_lat, origin_lon, origin_tz, local_dt)
         except Exception as e:
             # Handle polar day/night or undefined sun cases
             if "polar" in str(e).lower() or "sun" in str(e).lower():
@@ -146,25 +195,25 @@ def get_recommendation(request: RecommendationRequest):
                     detail={"error": "UNDEFINED_SUN", "message": f"Could not calculate sun position: {str(e)}"}
                 )
         
-        # DEBUG: Print the key values for seat decision
-        print(f"DEBUG: Origin: {request.origin.name} ({origin_lat}, {origin_lon})")
-        print(f"DEBUG: Destination: {request.destination.name} ({dest_lat}, {dest_lon})")
-        print(f"DEBUG: Flight Bearing: {flight_bearing}°")
-        print(f"DEBUG: Sun Azimuth: {sun_az}°")
-        print(f"DEBUG: Interest: {request.interest}")
-        print(f"DEBUG: Local Time: {request.local_datetime}")
+        # Log the key values for seat decision
+        logger.debug("Origin: %s (%s, %s)", request.origin.name, origin_lat, origin_lon)
+        logger.debug("Destination: %s (%s, %s)", request.destination.name, dest_lat, dest_lon)
+        logger.debug("Flight Bearing: %s°", flight_bearing)
+        logger.debug("Sun Azimuth: %s°", sun_az)
+        logger.debug("Interest: %s", request.interest)
+        logger.debug("Local Time: %s", request.local_datetime)
         
         # Make seat decision
         decision = seat_decision(flight_bearing, sun_az)
         
-        # DEBUG: Print the seat decision
-        print(f"DEBUG: Seat Decision: {decision}")
+        logger.debug("Seat Decision: %s", decision)
         
         # Calculate solar phase times
         try:
-            phases = phase_times(origin_lat, origin_lon, origin_tz, request.local_datetime)
+            # phase_times is cheap on repeat dates: utils.solar_context caches the sun times
+            phases = phase_times(origin_lat, origin_lon, origin_tz, local_dt)
             # If any phase is None, we're in polar conditions
-            if any(time is None for time in phases.values()):
+            if None in phases.values():
                 raise HTTPException(
                     status_code=400,
                     detail={"error": "POLAR_DAY", "message": "Solar phases undefined during polar day/night"}
@@ -176,43 +225,52 @@ def get_recommendation(request: RecommendationRequest):
             )
         
         # Check golden hour
-        is_golden_hour = golden_hour_flag(origin_lat, origin_lon, origin_tz, request.local_datetime, request.interest)
+        is_golden_hour = golden_hour_flag(origin_lat, origin_lon, origin_tz, local_dt, request.interest)
         
         # Calculate route midpoint and sun position there
         mid_lat, mid_lon = midpoint(origin_lat, origin_lon, dest_lat, dest_lon)
-        try:
-            mid_sun_az = sun_azimuth_at(mid_lat, mid_lon, origin_tz, request.local_datetime)
-        except Exception:
-            # If midpoint sun calculation fails, use departure sun position
+        if gc_distance_km(origin_lat, origin_lon, dest_lat, dest_lon) < SHORT_FLIGHT_KM:
+            # Short leg: the sun barely moves relative to the route, so reuse
+            # the departure solution instead of recomputing it at the midpoint
             mid_sun_az = sun_az
+            mid_decision = decision
+        else:
+            try:
+                mid_sun_az = cached_sun_azimuth_at(mid_lat, mid_lon, origin_tz, local_dt)
+            except Exception:
+                # If midpoint sun calculation fails, use departure sun position
+                mid_sun_az = sun_az
+            mid_decision = seat_decision(flight_bearing, mid_sun_az)
         
         # Calculate stability
-        mid_decision = seat_decision(flight_bearing, mid_sun_az)
         stability = calculate_stability(
             decision, mid_decision, 
-            decision["angle"], mid_decision["angle"]
+            decision.angle, mid_decision.angle
         )
         
         # Build response
-        response = RecommendationResponse(
-            side=decision["side"],
-            confidence=decision["confidence"],
-            bearing_deg=round(flight_bearing, 1),
-            sun_azimuth_deg=round(sun_az, 1),
-            relative_angle_deg=round(decision["angle"], 1),
-            golden_hour=is_golden_hour,
-            phase_times=phases,
-            midpoint={
+        response = REC_ADAPTER.validate_python({
+            "side": decision.side,
+            "confidence": decision.confidence,
+            "bearing_deg": round(flight_bearing, 1),
+            "sun_azimuth_deg": round(sun_az, 1),
+            "relative_angle_deg": round(decision.angle, 1),
+            "golden_hour": is_golden_hour,
+            "phase_times": phases,
+            "midpoint": {
                 "lat": round(mid_lat, 1),
                 "lon": round(mid_lon, 1),
                 "sun_azimuth_deg": round(mid_sun_az, 1)
             },
-            stability=stability,
-            notes=decision["notes"] + "; departure snapshot; great-circle assumption."
-        )
+            "stability": stability,
+            "notes": decision.notes + "; departure snapshot; great-circle assumption."
+        })
         
-        print(f"DEBUG: Final Response Side: {response.side}")
-        return response
+        logger.debug("Final Response Side: %s", response.side)
+        return Response(
+            content=REC_ADAPTER.dump_json(response),
+            media_type="application/json"
+        )
         
     except HTTPException:
         # Re-raise HTTP exceptions (our error responses)
@@ -1,247 +1,234 @@
 # PDF export functionality using reportlab
-import base64
 import io
-from typing import Optional
+import struct
+from typing import Optional, Tuple, Union
 from datetime import datetime
+import pybase64
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Flowable
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from api_schemas import RecommendationResponse
 
+_PNG_DATA_URI_PREFIX = 'data:image/png;base64,'
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
-def create_seat_diagram_svg(side: str, layout: str = "3-3") -> str:
-    """Create a simple SVG seat diagram highlighting the recommended side."""
-    
-    if layout == "3-3":
-        # Standard narrow-body layout
-        width, height = 200, 120
-        seats_left = [(20, 30), (20, 50), (20, 70)]  # Window, Middle, Aisle
-        seats_right = [(160, 30), (160, 50), (160, 70)]  # Aisle, Middle, Window
-        aisle_x = 100
-    else:  # 2-4-2 wide-body layout
-        width, height = 280, 120
-        seats_left = [(20, 40), (20, 60)]  # Window, Aisle
-        seats_center = [(90, 30), (90, 50), (90, 70), (90, 90)]  # Center section
-        seats_right = [(240, 40), (240, 60)]  # Aisle, Window
-        aisle_x = 60
-    
-    # Determine highlight color based on recommendation
-    if side == "LEFT":
-        left_color = "#FFD700"  # Gold for recommended
-        right_color = "#E0E0E0"  # Gray for not recommended
-    elif side == "RIGHT":
-        left_color = "#E0E0E0"
-        right_color = "#FFD700"
-    else:  # EITHER
-        left_color = "#F0F0F0"  # Light gray for both
-        right_color = "#F0F0F0"
-    
-    svg_parts = [
-        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
-        f'<rect width="{width}" height="{height}" fill="white" stroke="black"/>',
-        f'<text x="{width//2}" y="15" text-anchor="middle" font-size="12" font-weight="bold">Aircraft Seat Map</text>',
-    ]
-    
-    # Draw seats
-    if layout == "3-3":
-        # Left side seats
-        for i, (x, y) in enumerate(seats_left):
-            color = left_color if i == 0 else "#E0E0E0"  # Only window seat highlighted
-            svg_parts.append(f'<rect x="{x}" y="{y}" width="15" height="15" fill="{color}" stroke="black"/>')
+# Text-based seat diagrams (we can't easily embed SVG), pre-rendered as
+# Paragraph markup so generate_pdf doesn't rescan them on every request
+_DIAGRAM_LEFT_HTML = """
+        [🟨] [ ] [ ]    [ ] [ ] [ ]
+         W   M   A      A   M   W
         
-        # Right side seats  
-        for i, (x, y) in enumerate(seats_right):
-            color = right_color if i == 2 else "#E0E0E0"  # Only window seat highlighted
-            svg_parts.append(f'<rect x="{x}" y="{y}" width="15" height="15" fill="{color}" stroke="black"/>')
+        🟨 = Recommended window seat
+        W = Window, M = Middle, A = Aisle
+        """.replace('\n', '<br/>')
+
+_DIAGRAM_RIGHT_HTML = """
+        [ ] [ ] [ ]    [ ] [ ] [🟨]
+         W   M   A      A   M   W
         
-        # Aisle
-        svg_parts.append(f'<line x1="{aisle_x}" y1="25" x2="{aisle_x}" y2="95" stroke="blue" stroke-width="2"/>')
-        svg_parts.append(f'<text x="{aisle_x}" y="110" text-anchor="middle" font-size="10">Aisle</text>')
-    
-    # Add labels
-    svg_parts.append('<text x="10" y="110" font-size="10">Left</text>')
-    svg_parts.append(f'<text x="{width-30}" y="110" font-size="10">Right</text>')
-    
-    # Add recommendation text
-    rec_text = f"Recommended: {side} window"
-    svg_parts.append(f'<text x="{width//2}" y="{height-5}" text-anchor="middle" font-size="11" font-weight="bold">{rec_text}</text>')
-    
-    svg_parts.append('</svg>')
-    return ''.join(svg_parts)
+        🟨 = Recommended window seat  
+        W = Window, M = Middle, A = Aisle
+        """.replace('\n', '<br/>')
+
+_DIAGRAM_EITHER_HTML = """
+        [?] [ ] [ ]    [ ] [ ] [?]
+         W   M   A      A   M   W
+        
+        ? = Either window seat (low confidence)
+        W = Window, M = Middle, A = Aisle
+        """.replace('\n', '<br/>')
+
+_DIAGRAMS = {
+    "LEFT": _DIAGRAM_LEFT_HTML,
+    "RIGHT": _DIAGRAM_RIGHT_HTML,
+    "EITHER": _DIAGRAM_EITHER_HTML,
+}
+
+# Styles are immutable once built, so construct them once at import
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=18,
+    spaceAfter=20,
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'], 
+    fontSize=14,
+    spaceAfter=10,
+    textColor=colors.darkblue
+)
+
+_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    alignment=TA_CENTER,
+    textColor=colors.grey
+)
+
+def _png_size(data: bytes) -> Tuple[int, int]:
+    """Read (width, height) from a PNG's IHDR chunk without decoding the image."""
+    if len(data) < 24 or not data.startswith(_PNG_SIGNATURE) or data[12:16] != b'IHDR':
+        raise ValueError("Not a PNG image")
+    return struct.unpack('>II', data[16:24])
+
+
+class KeyValueTable(Flowable):
+    """Two-column label/value grid drawn straight onto the canvas.
+
+    The report's tables have a fixed shape (single-line Helvetica 10 cells),
+    so rows are placed at precomputed offsets instead of going through the
+    platypus Table wrap/split layout pass. Matches the previous Table look:
+    18pt rows, 6pt cell padding, grey label column, 1pt black grid.
+    """
+    ROW_HEIGHT = 18
+    PADDING = 6
+    BASELINE = 5
+    FONT_NAME = 'Helvetica'
+    FONT_SIZE = 10
+
+    def __init__(self, rows, col_widths):
+        super().__init__()
+        self.rows = rows
+        self.col_widths = col_widths
+        self.width = sum(col_widths)
+        self.height = self.ROW_HEIGHT * len(rows)
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        c = self.canv
+        label_width = self.col_widths[0]
+        
+        # Label column background
+        c.setFillColor(colors.lightgrey)
+        c.rect(0, 0, label_width, self.height, stroke=0, fill=1)
+        
+        # Cell text, top row first
+        c.setFillColor(colors.black)
+        c.setFont(self.FONT_NAME, self.FONT_SIZE)
+        y = self.height - self.ROW_HEIGHT + self.BASELINE
+        for label, value in self.rows:
+            c.drawString(self.PADDING, y, label)
+            c.drawString(label_width + self.PADDING, y, value)
+            y -= self.ROW_HEIGHT
+        
+        # Grid
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1)
+        c.grid(
+            [0, label_width, self.width],
+            [self.ROW_HEIGHT * i for i in range(len(self.rows) + 1)]
+        )
+
 
+def generate_pdf(recommendation: Union[RecommendationResponse, dict], map_png_base64: Optional[str] = None) -> bytes:
+    """Generate PDF report with recommendation data and optional map.
 
-def generate_pdf(recommendation: RecommendationResponse, map_png_base64: Optional[str] = None) -> bytes:
-    """Generate PDF report with recommendation data and optional map."""
+    Accepts an already-validated RecommendationResponse or a dict of the same
+    shape; the model is dumped to a dict once and read with plain key access.
+    """
+    r = recommendation.model_dump() if isinstance(recommendation, RecommendationResponse) else recommendation
     
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
     
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'], 
-        fontSize=14,
-        spaceAfter=10,
-        textColor=colors.darkblue
-    )
-    
     # Build content
     content = []
     
     # Title
-    content.append(Paragraph("Scenic Seat Recommendation Report", title_style))
+    content.append(Paragraph("Scenic Seat Recommendation Report", _TITLE_STYLE))
     content.append(Spacer(1, 20))
     
     # Recommendation Summary
-    content.append(Paragraph("Recommendation Summary", heading_style))
+    content.append(Paragraph("Recommendation Summary", _HEADING_STYLE))
     
     summary_data = [
-        ["Recommended Side", recommendation.side],
-        ["Confidence Level", recommendation.confidence],
-        ["Flight Bearing", f"{recommendation.bearing_deg:.1f}°"],
-        ["Sun Azimuth", f"{recommendation.sun_azimuth_deg:.1f}°"],
-        ["Relative Angle (Δ)", f"{recommendation.relative_angle_deg:.1f}°"],
-        ["Golden Hour", "Yes" if recommendation.golden_hour else "No"],
-        ["Stability", recommendation.stability]
+        ["Recommended Side", r['side']],
+        ["Confidence Level", r['confidence']],
+        ["Flight Bearing", f"{r['bearing_deg']:.1f}°"],
+        ["Sun Azimuth", f"{r['sun_azimuth_deg']:.1f}°"],
+        ["Relative Angle (Δ)", f"{r['relative_angle_deg']:.1f}°"],
+        ["Golden Hour", "Yes" if r['golden_hour'] else "No"],
+        ["Stability", r['stability']]
     ]
     
-    summary_table = Table(summary_data, colWidths=[2.5*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    
-    content.append(summary_table)
+    content.append(KeyValueTable(summary_data, col_widths=[2.5*inch, 2*inch]))
     content.append(Spacer(1, 20))
     
     # Solar Information
-    content.append(Paragraph("Solar Phase Times", heading_style))
+    content.append(Paragraph("Solar Phase Times", _HEADING_STYLE))
     
     phase_data = [
-        ["Civil Dawn", recommendation.phase_times.civil_dawn],
-        ["Sunrise", recommendation.phase_times.sunrise],
-        ["Sunset", recommendation.phase_times.sunset],
-        ["Civil Dusk", recommendation.phase_times.civil_dusk]
+        ["Civil Dawn", r['phase_times']['civil_dawn']],
+        ["Sunrise", r['phase_times']['sunrise']],
+        ["Sunset", r['phase_times']['sunset']],
+        ["Civil Dusk", r['phase_times']['civil_dusk']]
     ]
     
-    phase_table = Table(phase_data, colWidths=[2*inch, 2.5*inch])
-    phase_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    content.append(phase_table)
+    content.append(KeyValueTable(phase_data, col_widths=[2*inch, 2.5*inch]))
     content.append(Spacer(1, 20))
     
     # Route Midpoint Information
-    content.append(Paragraph("Route Analysis", heading_style))
+    content.append(Paragraph("Route Analysis", _HEADING_STYLE))
     
     route_data = [
-        ["Midpoint Latitude", f"{recommendation.midpoint.lat:.2f}°"],
-        ["Midpoint Longitude", f"{recommendation.midpoint.lon:.2f}°"],
-        ["Sun Azimuth at Midpoint", f"{recommendation.midpoint.sun_azimuth_deg:.1f}°"],
-        ["Route Stability", recommendation.stability]
+        ["Midpoint Latitude", f"{r['midpoint']['lat']:.2f}°"],
+        ["Midpoint Longitude", f"{r['midpoint']['lon']:.2f}°"],
+        ["Sun Azimuth at Midpoint", f"{r['midpoint']['sun_azimuth_deg']:.1f}°"],
+        ["Route Stability", r['stability']]
     ]
     
-    route_table = Table(route_data, colWidths=[2.5*inch, 2*inch])
-    route_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    
-    content.append(route_table)
+    content.append(KeyValueTable(route_data, col_widths=[2.5*inch, 2*inch]))
     content.append(Spacer(1, 20))
     
     # Add seat diagram
-    content.append(Paragraph("Seat Diagram", heading_style))
-    
-    # Create simple text-based seat diagram since we can't easily embed SVG
-    if recommendation.side == "LEFT":
-        diagram_text = """
-        [🟨] [ ] [ ]    [ ] [ ] [ ]
-         W   M   A      A   M   W
-        
-        🟨 = Recommended window seat
-        W = Window, M = Middle, A = Aisle
-        """
-    elif recommendation.side == "RIGHT":
-        diagram_text = """
-        [ ] [ ] [ ]    [ ] [ ] [🟨]
-         W   M   A      A   M   W
-        
-        🟨 = Recommended window seat  
-        W = Window, M = Middle, A = Aisle
-        """
-    else:
-        diagram_text = """
-        [?] [ ] [ ]    [ ] [ ] [?]
-         W   M   A      A   M   W
-        
-        ? = Either window seat (low confidence)
-        W = Window, M = Middle, A = Aisle
-        """
+    content.append(Paragraph("Seat Diagram", _HEADING_STYLE))
     
-    content.append(Paragraph(diagram_text.replace('\n', '<br/>'), styles['Normal']))
+    content.append(Paragraph(_DIAGRAMS.get(r['side'], _DIAGRAM_EITHER_HTML), _STYLES['Normal']))
     content.append(Spacer(1, 20))
     
     # Add map if provided
-    if map_png_base64 and map_png_base64.startswith('data:image/png;base64,'):
+    if map_png_base64 and map_png_base64.startswith(_PNG_DATA_URI_PREFIX):
         try:
-            # Extract base64 data
-            base64_data = map_png_base64.split(',')[1]
-            image_data = base64.b64decode(base64_data)
-            
-            # Create image
-            img_buffer = io.BytesIO(image_data)
-            img = Image(img_buffer)
+            # Extract base64 data (slice past the prefix instead of split())
+            base64_data = map_png_base64[len(_PNG_DATA_URI_PREFIX):]
+            image_data = pybase64.b64decode(base64_data, validate=False)
             
-            # Scale image to fit (max 4 inches wide)
-            img.drawWidth = min(4*inch, img.imageWidth)
-            img.drawHeight = img.imageHeight * (img.drawWidth / img.imageWidth)
+            # Scale image to fit (max 4 inches wide), sized from the PNG header
+            image_width, image_height = _png_size(image_data)
+            draw_width = min(4*inch, image_width)
+            img = Image(io.BytesIO(image_data), width=draw_width,
+                        height=image_height * (draw_width / image_width))
             
-            content.append(Paragraph("Route Map", heading_style))
+            content.append(Paragraph("Route Map", _HEADING_STYLE))
             content.append(img)
             content.append(Spacer(1, 10))
             
         except Exception as e:
             # If image processing fails, add note
-            content.append(Paragraph("Route Map", heading_style))
-            content.append(Paragraph("Map image could not be processed.", styles['Normal']))
+            content.append(Paragraph("Route Map", _HEADING_STYLE))
+            content.append(Paragraph("Map image could not be processed.", _STYLES['Normal']))
             content.append(Spacer(1, 10))
     else:
-        content.append(Paragraph("Route Map", heading_style))
-        content.append(Paragraph("Map not available - image not provided or invalid format.", styles['Normal']))
+        content.append(Paragraph("Route Map", _HEADING_STYLE))
+        content.append(Paragraph("Map not available - image not provided or invalid format.", _STYLES['Normal']))
         content.append(Spacer(1, 10))
     
     # Add notes and methodology
-    content.append(Paragraph("Notes & Methodology", heading_style))
-    content.append(Paragraph(recommendation.notes, styles['Normal']))
+    content.append(Paragraph("Notes & Methodology", _HEADING_STYLE))
+    content.append(Paragraph(r['notes'], _STYLES['Normal']))
     content.append(Spacer(1, 10))
     
     methodology_text = """
@@ -253,26 +240,18 @@ def generate_pdf(recommendation: RecommendationResponse, map_png_base64: Optiona
     • Embedded city database (no live geocoding)
     """
     
-    content.append(Paragraph(methodology_text, styles['Normal']))
+    content.append(Paragraph(methodology_text, _STYLES['Normal']))
     content.append(Spacer(1, 20))
     
     # Footer
     footer_text = f"Generated on {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC by Scenic Seat API v1.0.0"
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_CENTER,
-        textColor=colors.grey
-    )
-    content.append(Paragraph(footer_text, footer_style))
+    content.append(Paragraph(footer_text, _FOOTER_STYLE))
     
     # Build PDF
     doc.build(content)
     
-    # Get PDF bytes
-    buffer.seek(0)
-    return buffer.read()
+    # Get PDF bytes without an extra seek + read copy
+    return buffer.getvalue()
 
 
 
@@ -0,0 +1,37 @@
+# Optional ahead-of-time build of the pure math module (utils.py) with mypyc.
+# The app runs unchanged from source; this only produces a faster drop-in
+# utils extension next to utils.py:
+#
+#   pip install mypy
+#   SCENIC_SEAT_MYPYC=1 python setup.py build_ext --inplace
+#
+# This is not an installable package: without SCENIC_SEAT_MYPYC=1 the script
+# exits, so `pip install ./backend` cannot drop a generic top-level `utils`
+# module into site-packages.
+#
+# mypyc and Numba are alternatives, so build this only where Numba is not
+# installed:
+# - With Numba installed, `mypy utils.py` reports no-redef on the njit
+#   fallback. The fallback carries `# type: ignore` comments so the module
+#   type-checks in both environments.
+# - Numba cannot JIT an already compiled function, so importing the built
+#   extension fails with a TypeError once Numba is present.
+
+import importlib.util
+import os
+
+from setuptools import setup
+
+if os.environ.get("SCENIC_SEAT_MYPYC") != "1":
+    raise SystemExit("setup.py only builds the mypyc extension; set SCENIC_SEAT_MYPYC=1")
+if importlib.util.find_spec("numba") is not None:
+    raise SystemExit("mypyc build of utils.py requires Numba to be uninstalled")
+
+from mypyc.build import mypycify
+
+setup(
+    name="scenic-seat-backend",
+    # Nothing to install; build_ext --inplace writes the extension next to utils.py
+    py_modules=[],
+    ext_modules=mypycify(["--ignore-missing-imports", "utils.py"]),
+)
@@ -0,0 +1,167 @@
+# Tests for the pure math helpers in utils.py
+# Run from backend/: python -m pytest tests/
+
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from utils import (
+    bearing_gc, bearing_gc_vec, normalize180, normalize180_vec, midpoint, midpoint_vec,
+    julian_day, sun_azimuth_at, sun_azimuth_batch, seat_decision, seat_decision_codes,
+    seat_decision_codes_vec, SEAT_CODE_SIDE_MASK, SEAT_CODE_CONF_SHIFT
+)
+
+
+def angular_difference(a, b):
+    """Absolute difference of two angles on the circle, in degrees."""
+    return np.abs(normalize180_vec(np.subtract(a, b)))
+
+
+@pytest.mark.parametrize("angle, expected", [
+    (180.0, 180.0),
+    (-180.0, 180.0),
+    (540.0, 180.0),
+    (-179.99999999999997, -179.99999999999997),
+])
+def test_normalize180_edges(angle, expected):
+    assert normalize180(angle) == expected
+    assert normalize180_vec(angle) == expected
+
+
+def test_normalize180_keeps_in_range_angles_unchanged():
+    angles = [-179.99999999999997, math.nextafter(-180.0, 0.0), -90.0, -0.0, 0.0, 45.5, 180.0]
+    for angle in angles:
+        assert normalize180(angle) == angle
+    np.testing.assert_array_equal(normalize180_vec(angles), angles)
+
+
+def test_bearing_gc_wraps_negative_bearings():
+    # Destination 1° of arc from (0, 0) on an initial course of 350°
+    distance, course = math.radians(1.0), math.radians(350.0)
+    lat2 = math.degrees(math.asin(math.sin(distance) * math.cos(course)))
+    lon2 = math.degrees(math.atan2(math.sin(course) * math.sin(distance), math.cos(distance)))
+    assert bearing_gc(0.0, 0.0, lat2, lon2) == pytest.approx(350.0)
+    assert bearing_gc_vec(0.0, 0.0, lat2, lon2) == pytest.approx(350.0)
+    assert bearing_gc(0.0, 0.0, 0.0, -10.0) == pytest.approx(270.0)
+
+
+def test_bearing_gc_tiny_negative_bearing_folds_to_zero():
+    # atan2 gives about -5.7e-15°, which a plain floor fold would round up to 360.0
+    assert bearing_gc(0.0, 0.0, 10.0, -1e-15) == 0.0
+    assert bearing_gc_vec(0.0, 0.0, 10.0, -1e-15) == 0.0
+
+
+def test_bearing_gc_nan_coordinates_give_nan():
+    assert math.isnan(bearing_gc(math.nan, 77.1, 1.36, 103.99))
+    assert math.isnan(bearing_gc_vec(math.nan, 77.1, 1.36, 103.99))
+
+
+@pytest.mark.parametrize("lat", [-89.0, -66.5, -33.9, 0.0, 1.4, 28.6, 51.5, 69.7, 89.0])
+@pytest.mark.parametrize("lon", [-179.5, -73.8, 0.0, 103.9, 179.5])
+def test_sun_azimuth_batch_matches_astral(lat, lon):
+    # Whole-second times only: astral drops microseconds, julian_day keeps them
+    times = [
+        datetime(2025, 3, 20, 0, 0, 0, tzinfo=timezone.utc),
+        datetime(2025, 6, 21, 6, 30, 15, tzinfo=timezone.utc),
+        datetime(2025, 9, 10, 12, 0, 59, tzinfo=timezone.utc),
+        datetime(2024, 12, 21, 18, 45, 1, tzinfo=timezone.utc),
+        datetime(2031, 1, 1, 23, 59, 59, tzinfo=timezone.utc),
+    ]
+    expected = [sun_azimuth_at(lat, lon, "UTC", dt) for dt in times]
+    actual = sun_azimuth_batch([julian_day(dt) for dt in times], lat, lon)
+    assert np.all(angular_difference(actual, expected) < 1e-5)
+
+
+def test_sun_azimuth_batch_broadcasts_and_accepts_empty():
+    dt = datetime(2025, 6, 21, 6, 30, 15, tzinfo=timezone.utc)
+    lats = np.array([[-30.0], [0.0], [45.0]])
+    lons = np.array([-120.0, 0.0, 60.0, 150.0])
+    azimuths = sun_azimuth_batch(julian_day(dt), lats, lons)
+    assert azimuths.shape == (3, 4)
+    for i, lat in enumerate(lats[:, 0]):
+        for j, lon in enumerate(lons):
+            assert azimuths[i, j] == sun_azimuth_batch([julian_day(dt)], lat, lon)[0]
+
+    empty = sun_azimuth_batch(np.empty(0), np.empty(0), np.empty(0))
+    assert empty.shape == (0,)
+    assert sun_azimuth_batch(np.empty((0, 3)), 10.0, 20.0).shape == (0, 3)
+
+
+@pytest.mark.parametrize("bearing, sun", [
+    (math.nan, 10.0),
+    (10.0, math.nan),
+    (10.0, math.inf),
+    (-math.inf, 10.0),
+    (math.inf, math.inf),
+])
+def test_seat_decision_non_finite_delta(bearing, sun):
+    # Same defined answer with or without Numba (the reference policy's result for NaN)
+    decision = seat_decision(bearing, sun)
+    assert math.isnan(decision.angle)
+    assert (decision.side, decision.confidence, decision.notes) == (
+        "LEFT", "LOW", "Sun on left side of flight path"
+    )
+    delta, code = seat_decision_codes(bearing, sun)
+    assert math.isnan(delta)
+    assert code == 0
+
+
+@pytest.mark.parametrize("angle", [math.nan, math.inf, -math.inf])
+def test_normalize180_non_finite_is_nan(angle):
+    assert math.isnan(normalize180(angle))
+
+
+def _seat_code_sample():
+    """Boundary deltas (exact and ±1e-9) against two bearings, plus random pairs."""
+    boundaries = [sign * edge for edge in (0.0, 15.0, 45.0, 135.0, 150.0, 165.0, 180.0) for sign in (1.0, -1.0)]
+    deltas = [edge + offset for edge in boundaries for offset in (0.0, 1e-9, -1e-9)]
+    bearings = [0.0] * len(deltas) + [237.5] * len(deltas)
+    suns = deltas + [237.5 + delta for delta in deltas]
+    rng = np.random.default_rng(7)
+    bearings += list(rng.uniform(0.0, 360.0, 2000))
+    suns += list(rng.uniform(0.0, 360.0, 2000))
+    bearings += [math.nan, 0.0]
+    suns += [10.0, math.inf]
+    return bearings, suns
+
+
+def test_seat_decision_codes_vec_matches_scalar():
+    bearings, suns = _seat_code_sample()
+    with np.errstate(invalid="ignore"):
+        deltas, codes = seat_decision_codes_vec(bearings, suns)
+    assert codes.dtype == np.uint8
+    for bearing, sun, delta, code in zip(bearings, suns, deltas, codes):
+        scalar_delta, scalar_code = seat_decision_codes(bearing, sun)
+        assert code == scalar_code
+        np.testing.assert_equal(delta, scalar_delta)
+
+        decision = seat_decision(bearing, sun)
+        assert ("LEFT", "RIGHT", "EITHER")[code & SEAT_CODE_SIDE_MASK] == decision.side
+        assert ("LOW", "MEDIUM", "HIGH")[code >> SEAT_CODE_CONF_SHIFT] == decision.confidence
+
+
+def test_midpoint_vec_matches_scalar():
+    # Antimeridian crossings, where lon1 + atan2(...) leaves (-180, 180] before the fold
+    routes = [
+        (35.5, 139.8, 37.6, -122.4),
+        (0.0, 170.0, 0.0, -170.0),
+        (0.0, -170.0, 0.0, 170.0),
+        (10.0, 179.0, -10.0, -179.0),
+        (60.0, -175.0, 50.0, 160.0),
+        (-33.9, 151.2, -36.8, -174.8),
+    ]
+    rng = np.random.default_rng(11)
+    routes += list(zip(
+        rng.uniform(-90.0, 90.0, 2000), rng.uniform(-180.0, 180.0, 2000),
+        rng.uniform(-90.0, 90.0, 2000), rng.uniform(-180.0, 180.0, 2000)
+    ))
+    lat1, lon1, lat2, lon2 = (np.array(column) for column in zip(*routes))
+
+    lats, lons = midpoint_vec(lat1, lon1, lat2, lon2)
+    expected = np.array([midpoint(*route) for route in routes])
+    # np.hypot and sqrt may round differently, so allow a few ulps
+    np.testing.assert_allclose(lats, expected[:, 0], rtol=0.0, atol=1e-9)
+    assert np.all(angular_difference(lons, expected[:, 1]) < 1e-9)
+    assert np.all((lons > -180.0) & (lons <= 180.0))
@@ -2,222 +2,553 @@
 # All angles in degrees, 0° = North, clockwise positive
 # Global convention: Δ = wrap_to_(-180, 180] of (sun_azimuth - flight_bearing)
 
+import logging
 import math
-from datetime import datetime
+from functools import lru_cache
+from datetime import date, datetime
 from dateutil import tz
-from astral import LocationInfo
-from astral.sun import sun, golden_hour
-from typing import Dict, Tuple
+from astral import Observer
+from astral.sun import azimuth, sun, golden_hour
+from typing import Dict, NamedTuple, Optional, Tuple, Union
 
+import numpy as np
+from numpy.typing import ArrayLike
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        return lambda func: func
+    prange = range  # type: ignore[misc]
+
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius used for great-circle distances
+EARTH_RADIUS_KM = 6371.0
+
+# Degree/radian conversion factors (same values math.radians/math.degrees use)
+DEG2RAD = math.pi / 180.0
+RAD2DEG = 180.0 / math.pi
+
+
+@njit("f8(f8, f8, f8, f8)", cache=True)
 def bearing_gc(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate great-circle bearing from point 1 to point 2.
     Returns initial forward azimuth in degrees (0° = North, clockwise positive).
     """
     # Convert to radians
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    dlon_rad = math.radians(lon2 - lon1)
+    lat1_rad = lat1 * DEG2RAD
+    lat2_rad = lat2 * DEG2RAD
+    dlon_rad = (lon2 - lon1) * DEG2RAD
+    
+    # Shared trig terms, each evaluated once
+    cos_lat1 = math.cos(lat1_rad)
+    sin_lat1 = math.sin(lat1_rad)
+    cos_lat2 = math.cos(lat2_rad)
+    sin_lat2 = math.sin(lat2_rad)
     
     # Great circle bearing formula
-    y = math.sin(dlon_rad) * math.cos(lat2_rad)
-    x = (math.cos(lat1_rad) * math.sin(lat2_rad) - 
-         math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon_rad))
+    y = math.sin(dlon_rad) * cos_lat2
+    x = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * math.cos(dlon_rad)
     
     # Calculate bearing in radians, then convert to degrees
     bearing_rad = math.atan2(y, x)
-    bearing_deg = math.degrees(bearing_rad)
+    bearing_deg = bearing_rad * RAD2DEG
     
-    # Normalize to [0, 360) then return as 0° = North convention
-    return (bearing_deg + 360) % 360
+    # Normalize to [0, 360) then return as 0° = North convention.
+    # Shift first so tiny negative bearings fold to 0 rather than rounding to 360.
+    # NaN coordinates give NaN (floor would need an int, as in normalize180).
+    shifted = bearing_deg + 360.0
+    if not math.isfinite(shifted):
+        return math.nan
+    return shifted - 360.0 * math.floor(shifted / 360.0)
 
 
+def gc_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate great-circle (haversine) distance between two points in kilometres.
+    """
+    lat1_rad = lat1 * DEG2RAD
+    lat2_rad = lat2 * DEG2RAD
+    dlat_rad = lat2_rad - lat1_rad
+    dlon_rad = (lon2 - lon1) * DEG2RAD
+    
+    a = (math.sin(dlat_rad / 2) ** 2 +
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon_rad / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@njit("f8(f8)", cache=True)
 def normalize180(x: float) -> float:
     """
-    Normalize angle to (-180, 180] degrees.
+    Normalize angle to (-180, 180] degrees. NaN and ±inf give NaN.
+    """
+    # ceil would convert a non-finite quotient to int: an error in Python, undefined under Numba
+    if not math.isfinite(x):
+        return math.nan
+    # Subtract whole turns in one step; ceil keeps +180 and maps -180 to +180.
+    # Just above a multiple of -180 the division can round onto the whole turn
+    # (e.g. -179.99999999999997 gives 180.00000000000003); fold that one turn back.
+    result = x - 360.0 * math.ceil((x - 180.0) / 360.0)
+    return result - 360.0 * (result > 180.0)
+
+
+@lru_cache(maxsize=512)
+def _get_tz(tz_str: str):
+    """Resolve an IANA timezone once per name instead of on every call."""
+    return tz.gettz(tz_str)
+
+
+@lru_cache(maxsize=1024)
+def _get_observer(lat: float, lon: float) -> Observer:
+    """Build the sea-level astral observer for a coordinate once and reuse it."""
+    return Observer(latitude=lat, longitude=lon, elevation=0)
+
+
+def parse_local_datetime(local_dt: Union[str, datetime], tz_str: str) -> datetime:
+    """
+    Parse an ISO datetime string (or pass through a datetime) as a timezone-aware datetime.
+    Naive values are interpreted in tz_str.
     """
-    # Use modulo to get to (-360, 360), then adjust to (-180, 180]
-    result = x % 360
-    if result > 180:
-        result -= 360
-    elif result <= -180:
-        result += 360
-    return result
+    if isinstance(local_dt, str):
+        local_dt = datetime.fromisoformat(local_dt.replace('Z', '+00:00'))
+    if local_dt.tzinfo is None:
+        local_dt = local_dt.replace(tzinfo=_get_tz(tz_str))
+    return local_dt
 
 
-def sun_azimuth_at(lat: float, lon: float, tz_str: str, local_dt_iso: str) -> float:
+def sun_azimuth_at(lat: float, lon: float, tz_str: str, local_dt: Union[str, datetime]) -> float:
     """
     Calculate sun azimuth at given location and time.
     Returns azimuth in degrees (0° = North, clockwise positive).
     """
     # Parse timezone-aware datetime
-    timezone = tz.gettz(tz_str)
-    dt = datetime.fromisoformat(local_dt_iso.replace('Z', '+00:00'))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone)
+    dt = parse_local_datetime(local_dt, tz_str)
     
     # Calculate sun position using astral
-    from astral import Observer
-    observer = Observer(latitude=lat, longitude=lon, elevation=0)
+    observer = _get_observer(lat, lon)
     
     # Get sun azimuth (astral returns 0° = North, clockwise positive - matches our convention)
-    from astral.sun import azimuth
     sun_az = azimuth(observer, dt)
     
     return sun_az
 
 
-def phase_times(lat: float, lon: float, tz_str: str, local_dt_iso: str) -> dict:
+# Sun altitudes (degrees) that astral solves for: sunrise/sunset and civil dawn/dusk
+SUNRISE_ALTITUDE_DEG = -0.833
+CIVIL_TWILIGHT_ALTITUDE_DEG = -6.0
+# Slack for the approximate declination below; only clear polar cases are predicted
+_POLAR_MARGIN_DEG = 2.0
+
+# Phase times reported when the sun never rises/sets (polar day/night)
+_NO_PHASE_TIMES = {
+    "civil_dawn": None,
+    "sunrise": None,
+    "sunset": None,
+    "civil_dusk": None
+}
+
+
+def is_polar_day_or_night(lat: float, local_date: date) -> bool:
+    """
+    Cheap analytic check that the sun stays below the horizon all day, or never
+    drops to civil twilight, so astral cannot solve the date.
+    Conservative: dates within a couple of degrees of the threshold report False.
+    """
+    day_index = local_date.timetuple().tm_yday - 1
+    declination = -23.44 * math.cos(math.radians(360.0 / 365.0 * (day_index + 10)))
+    max_altitude = 90.0 - abs(lat - declination)
+    min_altitude = abs(lat + declination) - 90.0
+    return (max_altitude < SUNRISE_ALTITUDE_DEG - _POLAR_MARGIN_DEG or
+            min_altitude > CIVIL_TWILIGHT_ALTITUDE_DEG + _POLAR_MARGIN_DEG)
+
+
+@lru_cache(maxsize=1024)
+def solar_context(lat: float, lon: float, tz_str: str, local_date: date) -> Optional[dict]:
+    """
+    Calculate astral sun times (dawn, sunrise, noon, sunset, dusk) for a location and local date.
+    Cached so phase_times and golden_hour_flag share one computation per request.
+    Returns None when the sun never rises/sets (polar day/night).
+    """
+    if is_polar_day_or_night(lat, local_date):
+        return None
+    try:
+        return sun(_get_observer(lat, lon), date=local_date, tzinfo=_get_tz(tz_str))
+    except ValueError:
+        # Polar date inside the analytic check's margin
+        return None
+
+
+@lru_cache(maxsize=1024)
+def solar_event_epochs(lat: float, lon: float, tz_str: str, local_date: date) -> Optional[Dict[str, float]]:
+    """
+    Sunrise/sunset of solar_context as POSIX timestamps, for plain float comparisons.
+    Returns None when the sun never rises/sets (polar day/night).
+    """
+    sun_times = solar_context(lat, lon, tz_str, local_date)
+    if sun_times is None:
+        return None
+    return {
+        "sunrise": sun_times['sunrise'].timestamp(),
+        "sunset": sun_times['sunset'].timestamp()
+    }
+
+
+def phase_times(lat: float, lon: float, tz_str: str, local_dt: Union[str, datetime]) -> dict:
     """
     Calculate solar phase times for given location, timezone and date.
     Returns dict with ISO format times in the specified timezone.
     """
     # Parse date from input
-    timezone = tz.gettz(tz_str)
-    dt = datetime.fromisoformat(local_dt_iso.replace('Z', '+00:00'))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone)
+    dt = parse_local_datetime(local_dt, tz_str)
     
-    # Create location with actual coordinates
-    location = LocationInfo(latitude=lat, longitude=lon)
-    location.timezone = tz_str
-    
-    try:
-        # Calculate sun times for the date
-        from astral.sun import sun
-        sun_times = sun(location.observer, date=dt.date(), tzinfo=timezone)
-        
-        return {
-            "civil_dawn": sun_times['dawn'].isoformat(),
-            "sunrise": sun_times['sunrise'].isoformat(),
-            "sunset": sun_times['sunset'].isoformat(), 
-            "civil_dusk": sun_times['dusk'].isoformat()
-        }
-    except Exception:
+    # Calculate sun times for the date
+    sun_times = solar_context(lat, lon, tz_str, dt.date())
+    if sun_times is None:
         # Handle polar day/night cases
-        return {
-            "civil_dawn": None,
-            "sunrise": None,
-            "sunset": None,
-            "civil_dusk": None
-        }
+        return dict(_NO_PHASE_TIMES)
+    
+    return {
+        "civil_dawn": sun_times['dawn'].isoformat(),
+        "sunrise": sun_times['sunrise'].isoformat(),
+        "sunset": sun_times['sunset'].isoformat(), 
+        "civil_dusk": sun_times['dusk'].isoformat()
+    }
+
+
+# Interests that have a golden hour, mapped to their astral sun() key
+_GOLDEN_HOUR_EVENTS = {"sunrise": "sunrise", "sunset": "sunset"}
 
+# Golden hour half-width: 45 minutes either side of sunrise/sunset, in seconds
+GOLDEN_HOUR_WINDOW_S = 45 * 60.0
 
-def golden_hour_flag(lat: float, lon: float, tz_str: str, local_dt_iso: str, interest: str) -> bool:
+
+def golden_hour_flag(lat: float, lon: float, tz_str: str, local_dt: Union[str, datetime], interest: str) -> bool:
     """
     Determine if time is within golden hour for given interest.
     Golden hour is ±45 minutes around sunrise/sunset.
     """
-    timezone = tz.gettz(tz_str)
-    dt = datetime.fromisoformat(local_dt_iso.replace('Z', '+00:00'))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone)
+    event = _GOLDEN_HOUR_EVENTS.get(interest.lower())
+    if event is None:
+        return False
     
-    # Create location with actual coordinates
-    location = LocationInfo(latitude=lat, longitude=lon)
-    location.timezone = tz_str
+    dt = parse_local_datetime(local_dt, tz_str)
     
-    try:
-        from astral.sun import sun
-        sun_times = sun(location.observer, date=dt.date(), tzinfo=timezone)
-        
-        if interest.lower() == 'sunrise':
-            target_time = sun_times['sunrise']
-        elif interest.lower() == 'sunset':
-            target_time = sun_times['sunset']
-        else:
-            return False
-        
-        # Check if within ±45 minutes of target time
-        time_diff = abs((dt - target_time).total_seconds())
-        return time_diff <= 45 * 60  # 45 minutes in seconds
-        
-    except Exception:
+    event_epochs = solar_event_epochs(lat, lon, tz_str, dt.date())
+    if event_epochs is None:
         return False
+    
+    # Check if within ±45 minutes of target time
+    return abs(dt.timestamp() - event_epochs[event]) <= GOLDEN_HOUR_WINDOW_S
 
 
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8)", cache=True)
 def midpoint(lat1: float, lon1: float, lat2: float, lon2: float) -> tuple[float, float]:
     """
     Calculate great-circle midpoint between two points.
     Returns (lat, lon) of midpoint.
     """
     # Convert to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
+    lat1_rad = lat1 * DEG2RAD
+    lon1_rad = lon1 * DEG2RAD
+    lat2_rad = lat2 * DEG2RAD
+    lon2_rad = lon2 * DEG2RAD
     
     dlon = lon2_rad - lon1_rad
     
+    # Shared trig terms, each evaluated once
+    cos_lat1 = math.cos(lat1_rad)
+    cos_lat2 = math.cos(lat2_rad)
+    
     # Midpoint calculation
-    Bx = math.cos(lat2_rad) * math.cos(dlon)
-    By = math.cos(lat2_rad) * math.sin(dlon)
+    Bx = cos_lat2 * math.cos(dlon)
+    By = cos_lat2 * math.sin(dlon)
+    cos_lat1_plus_Bx = cos_lat1 + Bx
     
     lat_mid_rad = math.atan2(
         math.sin(lat1_rad) + math.sin(lat2_rad),
-        math.sqrt((math.cos(lat1_rad) + Bx) ** 2 + By ** 2)
+        math.sqrt(cos_lat1_plus_Bx * cos_lat1_plus_Bx + By * By)
     )
     
-    lon_mid_rad = lon1_rad + math.atan2(By, math.cos(lat1_rad) + Bx)
+    lon_mid_rad = lon1_rad + math.atan2(By, cos_lat1_plus_Bx)
     
     # Convert back to degrees
-    lat_mid = math.degrees(lat_mid_rad)
-    lon_mid = math.degrees(lon_mid_rad)
+    lat_mid = lat_mid_rad * RAD2DEG
+    lon_mid = lon_mid_rad * RAD2DEG
     
-    # Normalize longitude to [-180, 180]
+    # lon1 + atan2(...) can land anywhere in (-360, 360]; fold back to (-180, 180]
     lon_mid = normalize180(lon_mid)
     
     return (lat_mid, lon_mid)
 
 
-def seat_decision(bearing: float, sun: float) -> dict:
+# Integer codes for seat decisions (used by the compiled core)
+SIDE_LEFT, SIDE_RIGHT, SIDE_EITHER = 0, 1, 2
+CONF_LOW, CONF_MEDIUM, CONF_HIGH = 0, 1, 2
+# Note codes reuse the side codes for LEFT/RIGHT; EITHER splits into ahead/behind
+NOTE_AHEAD, NOTE_BEHIND = 2, 3
+
+_SIDE_NAMES = ("LEFT", "RIGHT", "EITHER")
+_CONFIDENCE_NAMES = ("LOW", "MEDIUM", "HIGH")
+_NOTES = (
+    "Sun on left side of flight path",
+    "Sun on right side of flight path",
+    "Sun roughly ahead of flight path",
+    "Sun roughly behind flight path",
+)
+
+
+def _classify_delta(delta: float) -> Tuple[int, int, int]:
+    """Reference decision policy for a normalized Δ: (side, confidence, note) codes."""
+    abs_delta = abs(delta)
+    
+    # Determine side
+    if abs_delta < 15 or abs_delta > 150:
+        return SIDE_EITHER, CONF_LOW, NOTE_AHEAD if abs_delta < 15 else NOTE_BEHIND
+    side = SIDE_RIGHT if delta > 0 else SIDE_LEFT
+    
+    # Determine confidence
+    if 45 <= abs_delta <= 135:
+        confidence = CONF_HIGH
+    elif (15 <= abs_delta < 45) or (135 < abs_delta <= 165):
+        confidence = CONF_MEDIUM
+    else:
+        confidence = CONF_LOW
+    return side, confidence, side
+
+
+# Decision for every Δ in (-180, 180], precomputed at half-degree resolution:
+# entry 2*(k+180) covers Δ == k exactly and entry 2*(k+180)+1 covers k < Δ < k+1.
+# All policy boundaries are whole degrees, so this reproduces the strict and
+# non-strict comparisons above exactly, with no rounding band.
+_SEAT_LUT = tuple(
+    _classify_delta(k + 0.5 * inside)
+    for k in range(-180, 181)
+    for inside in (0, 1)
+)
+# NaN Δ (from NaN or infinite inputs) has no LUT slot; give it the reference policy's answer
+_SEAT_NONFINITE = _classify_delta(math.nan)
+
+
+@njit("Tuple((f8, i8, i8, i8))(f8, f8)", cache=True)
+def _seat_decision_core(bearing: float, sun: float) -> Tuple[float, int, int, int]:
+    """Numeric core of seat_decision: returns (Δ, side code, confidence code, note code)."""
+    # Calculate relative angle Δ = sun_azimuth - flight_bearing
+    delta = normalize180(sun - bearing)
+    if not math.isfinite(delta):
+        side, confidence, note = _SEAT_NONFINITE
+        return delta, side, confidence, note
+    whole = math.floor(delta)
+    side, confidence, note = _SEAT_LUT[2 * (int(whole) + 180) + (1 if delta > whole else 0)]
+    return delta, side, confidence, note
+
+
+class SeatRec(NamedTuple):
+    """Seat recommendation returned by seat_decision."""
+    side: str
+    angle: float
+    confidence: str
+    notes: str
+
+
+def seat_decision(bearing: float, sun: float) -> SeatRec:
     """
     Make seat recommendation based on bearing and sun azimuth.
-    Returns dict with keys: side, angle (Δ), confidence, notes
+    Returns SeatRec with fields: side, angle (Δ), confidence, notes (use _asdict() for a dict)
     
     Global convention: Δ = wrap_to_(-180, 180] of (sun_azimuth - flight_bearing)
     Decision policy: Δ>0 ⇒ RIGHT, Δ<0 ⇒ LEFT, |Δ|<15° or |Δ|>150° ⇒ EITHER/Low
     Confidence: High |Δ| ∈ [45°,135°], Medium |Δ| ∈ [15°,45°] ∪ [135°,165°], Low otherwise
     """
-    # Calculate relative angle Δ = sun_azimuth - flight_bearing
-    delta = normalize180(sun - bearing)
+    delta, side_code, confidence_code, note_code = _seat_decision_core(bearing, sun)
+    side = _SIDE_NAMES[side_code]
+    confidence = _CONFIDENCE_NAMES[confidence_code]
+    notes = _NOTES[note_code]
     
-    # DEBUG: Print the calculation details
-    print(f"DEBUG: seat_decision - Flight Bearing: {bearing}°, Sun Azimuth: {sun}°")
-    print(f"DEBUG: seat_decision - Raw Delta (sun - bearing): {sun - bearing}°")
-    print(f"DEBUG: seat_decision - Normalized Delta: {delta}°")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("seat_decision bearing=%s sun=%s delta=%s side=%s confidence=%s",
+                     bearing, sun, delta, side, confidence)
     
-    # Determine side
-    if abs(delta) < 15 or abs(delta) > 150:
-        side = "EITHER"
-        confidence = "LOW"
-        if abs(delta) < 15:
-            notes = "Sun roughly ahead of flight path"
-        else:
-            notes = "Sun roughly behind flight path"
-    elif delta > 0:
-        side = "RIGHT"
-        notes = "Sun on right side of flight path"
-    else:
-        side = "LEFT" 
-        notes = "Sun on left side of flight path"
-    
-    # Determine confidence (if not already set to LOW)
-    if side != "EITHER":
-        abs_delta = abs(delta)
-        if 45 <= abs_delta <= 135:
-            confidence = "HIGH"
-        elif (15 <= abs_delta < 45) or (135 < abs_delta <= 165):
-            confidence = "MEDIUM"
-        else:
-            confidence = "LOW"
+    return SeatRec(side, delta, confidence, notes)
+
+
+# Packed decision code for batched scoring: side in bits 0-1, confidence in bits 2-3
+SEAT_CODE_SIDE_MASK = 0b11
+SEAT_CODE_CONF_SHIFT = 2
+
+
+@njit("Tuple((f8, u1))(f8, f8)", cache=True)
+def seat_decision_codes(bearing: float, sun: float) -> Tuple[float, int]:
+    """
+    String-free seat_decision: returns (Δ, code) with code = side | (confidence << 2),
+    using the SIDE_* and CONF_* codes.
+    """
+    delta, side, confidence, _ = _seat_decision_core(bearing, sun)
+    return delta, side | (confidence << SEAT_CODE_CONF_SHIFT)
+
+
+# Vectorized NumPy variants for scoring many flights at once.
+# Same conventions as the scalar functions above; inputs may be scalars or arrays.
+
+def bearing_gc_vec(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> np.ndarray:
+    """
+    Vectorized great-circle bearing; see bearing_gc.
+    Returns initial forward azimuths in degrees, [0, 360).
+    """
+    lat1_rad = np.multiply(lat1, DEG2RAD)
+    lat2_rad = np.multiply(lat2, DEG2RAD)
+    dlon_rad = np.subtract(lon2, lon1) * DEG2RAD
     
-    print(f"DEBUG: seat_decision - Final Decision: Side={side}, Confidence={confidence}, Notes='{notes}'")
+    cos_lat2 = np.cos(lat2_rad)
+    y = np.sin(dlon_rad) * cos_lat2
+    x = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * cos_lat2 * np.cos(dlon_rad)
     
-    return {
-        "side": side,
-        "angle": delta,
-        "confidence": confidence,
-        "notes": notes
-    }
+    shifted = np.arctan2(y, x) * RAD2DEG + 360.0
+    return shifted - 360.0 * np.floor(shifted / 360.0)
+
+
+def normalize180_vec(x: ArrayLike) -> np.ndarray:
+    """
+    Vectorized normalize180: wrap angles to (-180, 180] without masks.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    result = x - 360.0 * np.ceil((x - 180.0) / 360.0)
+    return result - 360.0 * (result > 180.0)
+
+
+def midpoint_vec(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized great-circle midpoint; see midpoint.
+    Returns (lat, lon) arrays of midpoints.
+    """
+    lat1_rad = np.multiply(lat1, DEG2RAD)
+    lon1_rad = np.multiply(lon1, DEG2RAD)
+    lat2_rad = np.multiply(lat2, DEG2RAD)
+    dlon = np.multiply(lon2, DEG2RAD) - lon1_rad
+    
+    cos_lat2 = np.cos(lat2_rad)
+    Bx = cos_lat2 * np.cos(dlon)
+    By = cos_lat2 * np.sin(dlon)
+    cos_lat1_plus_Bx = np.cos(lat1_rad) + Bx
+    
+    lat_mid_rad = np.arctan2(
+        np.sin(lat1_rad) + np.sin(lat2_rad),
+        np.hypot(cos_lat1_plus_Bx, By)
+    )
+    lon_mid_rad = lon1_rad + np.arctan2(By, cos_lat1_plus_Bx)
+    
+    return lat_mid_rad * RAD2DEG, normalize180_vec(lon_mid_rad * RAD2DEG)
+
+
+# Packed copy of _SEAT_LUT; the extra last entry is the non-finite Δ decision
+_SEAT_CODE_LUT = np.array(
+    [side | (confidence << SEAT_CODE_CONF_SHIFT) for side, confidence, _ in _SEAT_LUT + (_SEAT_NONFINITE,)],
+    dtype=np.uint8
+)
+
+
+def seat_decision_codes_vec(bearing: ArrayLike, sun: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized seat_decision_codes; see seat_decision_codes.
+    Returns (Δ, code) arrays, codes as uint8.
+    """
+    delta = normalize180_vec(np.subtract(sun, bearing))
+    finite = np.isfinite(delta)
+    whole = np.floor(np.where(finite, delta, 0.0))
+    index = 2 * (whole.astype(np.intp) + 180) + (delta > whole)
+    return delta, _SEAT_CODE_LUT[np.where(finite, index, -1)]
+
+
+def julian_day(dt: datetime) -> float:
+    """
+    Julian Day (UT) for a timezone-aware datetime; naive values are taken as UTC.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_get_tz("UTC"))
+    return dt.timestamp() / 86400.0 + 2440587.5
+
+
+@njit(parallel=True, cache=True)
+def _sun_azimuth_kernel(jd: np.ndarray, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    # NOAA solar position equations, as used by astral.sun.azimuth
+    n = jd.shape[0]
+    out = np.empty(n)
+    for i in prange(n):
+        t = (jd[i] - 2451545.0) / 36525.0
+        
+        # Sun's mean longitude/anomaly and Earth's orbital eccentricity
+        l0 = (280.46646 + t * (36000.76983 + 0.0003032 * t)) % 360.0
+        m_rad = math.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+        e = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+        
+        # Apparent longitude and corrected obliquity of the ecliptic
+        eq_center = (math.sin(m_rad) * (1.914602 - t * (0.004817 + 0.000014 * t)) +
+                     math.sin(2.0 * m_rad) * (0.019993 - 0.000101 * t) +
+                     math.sin(3.0 * m_rad) * 0.000289)
+        omega_rad = math.radians(125.04 - 1934.136 * t)
+        apparent_long = l0 + eq_center - 0.00569 - 0.00478 * math.sin(omega_rad)
+        seconds = 21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))
+        obliquity = 23.0 + (26.0 + seconds / 60.0) / 60.0 + 0.00256 * math.cos(omega_rad)
+        obliquity_rad = math.radians(obliquity)
+        
+        # Declination and equation of time (minutes)
+        sin_decl = math.sin(obliquity_rad) * math.sin(math.radians(apparent_long))
+        cos_decl = math.sqrt(1.0 - sin_decl * sin_decl)
+        y = math.tan(obliquity_rad / 2.0) ** 2
+        l0_rad = math.radians(l0)
+        eq_time = 4.0 * math.degrees(
+            y * math.sin(2.0 * l0_rad) -
+            2.0 * e * math.sin(m_rad) +
+            4.0 * e * y * math.sin(m_rad) * math.cos(2.0 * l0_rad) -
+            0.5 * y * y * math.sin(4.0 * l0_rad) -
+            1.25 * e * e * math.sin(2.0 * m_rad)
+        )
+        
+        # Hour angle from true solar time, wrapped to (-180, 180]
+        utc_minutes = ((jd[i] + 0.5) % 1.0) * 1440.0
+        hour_angle = (utc_minutes + eq_time + 4.0 * lon[i]) / 4.0 - 180.0
+        hour_angle = hour_angle - 360.0 * math.ceil((hour_angle - 180.0) / 360.0)
+        
+        latitude = min(max(lat[i], -89.8), 89.8)
+        cos_lat = math.cos(math.radians(latitude))
+        sin_lat = math.sin(math.radians(latitude))
+        
+        cos_zenith = cos_lat * cos_decl * math.cos(math.radians(hour_angle)) + sin_lat * sin_decl
+        cos_zenith = min(max(cos_zenith, -1.0), 1.0)
+        sin_zenith = math.sqrt(1.0 - cos_zenith * cos_zenith)
+        
+        az_denom = cos_lat * sin_zenith
+        if abs(az_denom) > 0.001:
+            az_cos = min(max((sin_lat * cos_zenith - sin_decl) / az_denom, -1.0), 1.0)
+            az = 180.0 - math.degrees(math.acos(az_cos))
+            if hour_angle > 0.0:
+                az = -az
+        elif latitude > 0.0:
+            az = 180.0
+        else:
+            az = 0.0
+        
+        out[i] = az + 360.0 if az < 0.0 else az
+    return out
+
+
+def sun_azimuth_batch(jd: ArrayLike, lat: ArrayLike, lon: ArrayLike) -> np.ndarray:
+    """
+    Vectorized sun azimuth for many (time, lat, lon) samples, e.g. along a route.
+    jd is the Julian Day (UT) of each sample (see julian_day); inputs broadcast together.
+    Returns azimuths in degrees (0° = North, clockwise positive), matching sun_azimuth_at
+    to the second: astral drops microseconds while julian_day keeps them.
+    """
+    jd, lat, lon = np.broadcast_arrays(
+        np.asarray(jd, dtype=np.float64),
+        np.asarray(lat, dtype=np.float64),
+        np.asarray(lon, dtype=np.float64)
+    )
+    shape = jd.shape
+    azimuths = _sun_azimuth_kernel(
+        np.ascontiguousarray(jd).ravel(),
+        np.ascontiguousarray(lat).ravel(),
+        np.ascontiguousarray(lon).ravel()
+    )
+    return azimuths.reshape(shape)